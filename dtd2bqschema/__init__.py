@@ -1,4 +1,8 @@
-from .schema import Dtd2BqSchema
+from .schema import Dtd2BqSchema, DtdSchema
 from .dtddefinition import BqSchema
+from .profiler import XmlProfiler, ColumnStatistics, ColumnRefinement
+from .validator import XmlValidator, Violation
 
-__all__ = ["Dtd2BqSchema", "BqSchema"]
+__all__ = ["Dtd2BqSchema", "DtdSchema", "BqSchema",
+           "XmlProfiler", "ColumnStatistics", "ColumnRefinement",
+           "XmlValidator", "Violation"]
@@ -0,0 +1,247 @@
+from itertools import permutations
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .dtddefinition import (
+    ConstantDef,
+    ElementDef,
+    ElementTermDef,
+    SequenceFactorDef,
+    AndFactorDef,
+    OrFactorDef,
+    MayRepeatElementDef,
+    MustRepeatElementDef,
+    OneOrNothingElementDef,
+    RefElementDef,
+    RefEntityDef,
+    EntityDef
+)
+
+
+# "a & b & ..." is expanded to every order of its members up to this size.
+# Larger groups are relaxed to "(a | b | ...)*", which checks neither
+# that every member appears nor that it appears only once.
+MAX_AND_PERMUTATION: int = 4
+
+
+class UnconstrainedContent(Exception):
+    """
+    Raised while compiling a content model which can not be checked,
+    such as "ANY", SGML inclusions or unresolved entities.
+    """
+    pass
+
+
+class ContentAutomaton():
+    """
+    Deterministic automaton of child element names. State 0 is the start state.
+    """
+    START: int = 0
+
+    def __init__(self, transitions: List[Dict[str, int]], accepts: FrozenSet[int],
+                 unconstrained: bool = False):
+
+        self.transitions: List[Dict[str, int]] = transitions
+        self.accepts: FrozenSet[int] = accepts
+        self.unconstrained: bool = unconstrained
+
+    @classmethod
+    def any(cls) -> "ContentAutomaton":
+        return cls([{}], frozenset([cls.START]), unconstrained=True)
+
+    def next_state(self, state: int, element_name: str) -> Optional[int]:
+        if self.unconstrained is True:
+            return state
+        return self.transitions[state].get(element_name)
+
+    def is_accepting(self, state: int) -> bool:
+        return (self.unconstrained is True) or (state in self.accepts)
+
+    def expected(self, state: int) -> List[str]:
+        return sorted(self.transitions[state].keys())
+
+    def __repr__(self):
+        if self.unconstrained is True:
+            return "ContentAutomaton(ANY)"
+        return f"ContentAutomaton(states={len(self.transitions)}, accepts={sorted(self.accepts)})"
+
+
+class _Nfa():
+    def __init__(self):
+        self.epsilons: List[Set[int]] = []
+        self.moves: List[Dict[str, Set[int]]] = []
+
+    def new_state(self) -> int:
+        self.epsilons.append(set())
+        self.moves.append({})
+        return len(self.epsilons) - 1
+
+    def closure(self, states: Set[int]) -> FrozenSet[int]:
+        closed: Set[int] = set(states)
+        stack: List[int] = list(states)
+        while len(stack) > 0:
+            for target in self.epsilons[stack.pop()]:
+                if target not in closed:
+                    closed.add(target)
+                    stack.append(target)
+        return frozenset(closed)
+
+    def determinize(self, start: int, end: int) -> ContentAutomaton:
+        start_set: FrozenSet[int] = self.closure({start})
+        numbers: Dict[FrozenSet[int], int] = {start_set: ContentAutomaton.START}
+        pending: List[FrozenSet[int]] = [start_set]
+        transitions: List[Dict[str, int]] = [{}]
+        accepts: Set[int] = set()
+
+        while len(pending) > 0:
+            current: FrozenSet[int] = pending.pop()
+            number: int = numbers[current]
+            if end in current:
+                accepts.add(number)
+
+            targets: Dict[str, Set[int]] = {}
+            for state in current:
+                for symbol, moved in self.moves[state].items():
+                    targets.setdefault(symbol, set()).update(moved)
+
+            for symbol, moved in targets.items():
+                target_set: FrozenSet[int] = self.closure(moved)
+                if target_set not in numbers:
+                    numbers[target_set] = len(transitions)
+                    transitions.append({})
+                    pending.append(target_set)
+                transitions[number][symbol] = numbers[target_set]
+
+        return ContentAutomaton(transitions, frozenset(accepts))
+
+
+class AutomatonCompiler():
+    def __init__(self, elements: Dict[str, ElementDef], entities: Dict[str, EntityDef]):
+        self.elements: Dict[str, ElementDef] = elements
+        self.entities: Dict[str, EntityDef] = entities
+        self.automata: Dict[str, ContentAutomaton] = {}
+
+    def automaton(self, element_name: str) -> Optional[ContentAutomaton]:
+        cached: Optional[ContentAutomaton] = self.automata.get(element_name)
+        if cached is not None:
+            return cached
+
+        element: Optional[ElementDef] = self.elements.get(element_name)
+        if element is None:
+            return None
+
+        compiled: ContentAutomaton = self.compile(element)
+        self.automata[element_name] = compiled
+        return compiled
+
+    def compile_all(self) -> Dict[str, ContentAutomaton]:
+        for element_name in self.elements.keys():
+            self.automaton(element_name)
+        return self.automata
+
+    def compiled(self) -> "AutomatonCompiler":
+        """
+        Compiler holding only the automata of every element, without the definitions.
+        Undeclared elements still resolve to None.
+        """
+        compiled: AutomatonCompiler = AutomatonCompiler({}, {})
+        compiled.automata = dict(self.compile_all())
+        return compiled
+
+    def compile(self, element: ElementDef) -> ContentAutomaton:
+        nfa: _Nfa = _Nfa()
+        try:
+            start, end = self._build(nfa, element.sub_element, set())
+        except UnconstrainedContent:
+            return ContentAutomaton.any()
+
+        return nfa.determinize(start, end)
+
+    def _build(self, nfa: _Nfa, node, expanding: Set[str]) -> Tuple[int, int]:
+        if isinstance(node, ConstantDef) is True:
+            if node == ConstantDef.ANY:
+                raise UnconstrainedContent(node.value)
+            # "EMPTY" and character data do not consume child elements.
+            return self._build_epsilon(nfa)
+
+        if isinstance(node, RefElementDef) is True:
+            start: int = nfa.new_state()
+            end: int = nfa.new_state()
+            nfa.moves[start].setdefault(str(node.element_name), set()).add(end)
+            return start, end
+
+        if isinstance(node, RefEntityDef) is True:
+            return self._build_entity(nfa, node, expanding)
+
+        if isinstance(node, OrFactorDef) is True:
+            return self._build_or(nfa, node.nodes, expanding)
+
+        if isinstance(node, AndFactorDef) is True:
+            return self._build_and(nfa, node.nodes, expanding)
+
+        if isinstance(node, (SequenceFactorDef, ElementTermDef)) is True:
+            return self._build_sequence(nfa, node.nodes, expanding)
+
+        if isinstance(node, (MayRepeatElementDef, MustRepeatElementDef, OneOrNothingElementDef)) is True:
+            return self._build_factor(nfa, node, expanding)
+
+        # "+(...)" and "-(...)" (SGML inclusions / exclusions)
+        raise UnconstrainedContent(repr(node))
+
+    def _build_epsilon(self, nfa: _Nfa) -> Tuple[int, int]:
+        start: int = nfa.new_state()
+        end: int = nfa.new_state()
+        nfa.epsilons[start].add(end)
+        return start, end
+
+    def _build_entity(self, nfa: _Nfa, ref: RefEntityDef, expanding: Set[str]) -> Tuple[int, int]:
+        sub_entity: Optional[EntityDef] = self.entities.get(ref.entity_name)
+        if (sub_entity is None) or (ref.entity_name in expanding) \
+                or isinstance(sub_entity.contents, (tuple, str, EntityDef)):
+            raise UnconstrainedContent(ref.entity_name)
+
+        return self._build(nfa, sub_entity.contents, expanding | {ref.entity_name})
+
+    def _build_sequence(self, nfa: _Nfa, nodes: list, expanding: Set[str]) -> Tuple[int, int]:
+        start, end = self._build_epsilon(nfa)
+        for node in nodes:
+            sub_start, sub_end = self._build(nfa, node, expanding)
+            nfa.epsilons[end].add(sub_start)
+            end = sub_end
+        return start, end
+
+    def _build_or(self, nfa: _Nfa, nodes: list, expanding: Set[str]) -> Tuple[int, int]:
+        start: int = nfa.new_state()
+        end: int = nfa.new_state()
+        for node in nodes:
+            sub_start, sub_end = self._build(nfa, node, expanding)
+            nfa.epsilons[start].add(sub_start)
+            nfa.epsilons[sub_end].add(end)
+        return start, end
+
+    def _build_and(self, nfa: _Nfa, nodes: list, expanding: Set[str]) -> Tuple[int, int]:
+        if len(nodes) > MAX_AND_PERMUTATION:
+            start, end = self._build_or(nfa, nodes, expanding)
+            nfa.epsilons[start].add(end)
+            nfa.epsilons[end].add(start)
+            return start, end
+
+        start: int = nfa.new_state()
+        end: int = nfa.new_state()
+        for ordered in permutations(nodes):
+            sub_start, sub_end = self._build_sequence(nfa, list(ordered), expanding)
+            nfa.epsilons[start].add(sub_start)
+            nfa.epsilons[sub_end].add(end)
+        return start, end
+
+    def _build_factor(self, nfa: _Nfa, factor, expanding: Set[str]) -> Tuple[int, int]:
+        start: int = nfa.new_state()
+        end: int = nfa.new_state()
+        sub_start, sub_end = self._build(nfa, factor.node, expanding)
+        nfa.epsilons[start].add(sub_start)
+        nfa.epsilons[sub_end].add(end)
+
+        if isinstance(factor, (MayRepeatElementDef, MustRepeatElementDef)) is True:
+            nfa.epsilons[sub_end].add(sub_start)
+        if isinstance(factor, (MayRepeatElementDef, OneOrNothingElementDef)) is True:
+            nfa.epsilons[start].add(end)
+        return start, end
@@ -90,6 +90,8 @@ class DtdTransformer(Transformer):
         return ElementAttributeDef(children[0].value, children[1:])
 
     def attribute(self, children: list):
+        if isinstance(children[0], RefEntityDef) is True:
+            return children[0]
         return AttributeDef(children[0].value, children[1], children[2])
 
     def attribute_types(self, children: list):
@@ -122,6 +124,8 @@ class DtdTransformer(Transformer):
         return EntityDef(children[0].value, children[1])
 
     def entity_contents(self, children: list):
+        if (isinstance(children[0], AttributeDef) is True) or (len(children) > 1):
+            return tuple(children)
         return children[0]
 
     def entity_include(self, children: list):
@@ -0,0 +1,308 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from xml.etree.ElementTree import Element, ParseError, iterparse
+
+from .dtddefinition import (
+    BqColumnType,
+    BqColumnMode,
+    BqSchema,
+    BqUnitSchema,
+    BqRecordSchema
+)
+
+
+ColumnPath = Tuple[str, ...]
+
+# Only the canonical forms, so that values like "01000" keep their leading zeros as STRING.
+_FLOAT_PATTERN = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?")
+_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+_DATETIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d{1,6})?")
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _is_integer(value: str) -> bool:
+    try:
+        number: int = int(value)
+    except ValueError:
+        return False
+    return (str(number) == value) and (_INT64_MIN <= number <= _INT64_MAX)
+
+
+def _is_float(value: str) -> bool:
+    if _FLOAT_PATTERN.fullmatch(value) is None:
+        return False
+    # An integer out of INT64 range (e.g. a long ID) would lose digits as FLOAT.
+    return (value.lstrip("-").isdigit() is False) or _is_integer(value)
+
+
+def _is_date(value: str) -> bool:
+    if _DATE_PATTERN.fullmatch(value) is None:
+        return False
+    try:
+        date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    except ValueError:
+        return False
+    return True
+
+
+def _is_datetime(value: str) -> bool:
+    if _DATETIME_PATTERN.fullmatch(value) is None:
+        return False
+    try:
+        datetime.strptime(value[:19].replace("T", " "), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return False
+    return True
+
+
+# Narrower types first. The first type that every sampled value parses as wins.
+CANDIDATE_TYPES: List[Tuple[BqColumnType, Callable[[str], bool]]] = [
+    (BqColumnType.INTEGER, _is_integer),
+    (BqColumnType.FLOAT, _is_float),
+    (BqColumnType.DATE, _is_date),
+    (BqColumnType.DATETIME, _is_datetime),
+]
+
+
+class ColumnStatistics():
+    """
+    Value statistics of one column, kept as counters only so that
+    the results of each worker are cheap to pickle and merge.
+    """
+    __slots__ = ("count", "empty", "matched")
+
+    def __init__(self):
+        self.count: int = 0
+        self.empty: int = 0
+        self.matched: List[int] = [0] * len(CANDIDATE_TYPES)
+
+    def add(self, value: Optional[str]):
+        value = value.strip() if value is not None else ""
+        if len(value) == 0:
+            self.empty += 1
+            return
+
+        self.count += 1
+        for index, (_, is_type) in enumerate(CANDIDATE_TYPES):
+            if is_type(value) is True:
+                self.matched[index] += 1
+
+    def add_unmatched(self):
+        """
+        Count an occurrence which can not be narrowed, such as mixed content.
+        """
+        self.count += 1
+
+    def merge(self, other: "ColumnStatistics"):
+        self.count += other.count
+        self.empty += other.empty
+        self.matched = [mine + theirs for mine,
+                        theirs in zip(self.matched, other.matched)]
+        return self
+
+    def narrowed_type(self) -> Optional[BqColumnType]:
+        if self.count == 0:
+            return None
+        for (column_type, _), matched in zip(CANDIDATE_TYPES, self.matched):
+            if matched == self.count:
+                return column_type
+        return None
+
+    def confidence(self) -> float:
+        """
+        Lower bound (95%, "rule of three") of the share of all values
+        expected to parse as the narrowed type, given that every sampled
+        value did.
+        """
+        if self.count == 0:
+            return 0.0
+        return max(0.0, 1.0 - 3.0 / self.count)
+
+    def __repr__(self):
+        return (
+            f"ColumnStatistics(count={self.count}, empty={self.empty}"
+            f", matched={self.matched})"
+        )
+
+
+class ColumnRefinement():
+    def __init__(self, column_path: ColumnPath,
+                 before: BqColumnType, after: BqColumnType,
+                 confidence: float, samples: int):
+
+        self.column_path: ColumnPath = column_path
+        self.before: BqColumnType = before
+        self.after: BqColumnType = after
+        self.confidence: float = confidence
+        self.samples: int = samples
+
+    def __repr__(self):
+        return (
+            f"ColumnRefinement('{'.'.join(self.column_path)}'"
+            f", {self.before.value} -> {self.after.value}"
+            f", confidence={self.confidence:.3f}, samples={self.samples})"
+        )
+
+
+def profile_document(file_path: Union[Path, str]) -> Dict[ColumnPath, ColumnStatistics]:
+    """
+    Collect value statistics of one xml document.
+    Texts of leaf elements are keyed by the element path,
+    attributes by the element path followed by the attribute name.
+    Elements having child elements are counted as values of no type,
+    so that mixed content columns are kept as STRING.
+    """
+    statistics: Dict[ColumnPath, ColumnStatistics] = {}
+    path: List[str] = []
+    has_children: List[bool] = []
+    # Open elements, to detach each finished element from its parent.
+    parents: List[Element] = []
+
+    for event, elem in iterparse(str(file_path), events=("start", "end")):
+        if event == "start":
+            if len(has_children) > 0:
+                has_children[-1] = True
+            path.append(elem.tag)
+            has_children.append(False)
+            parents.append(elem)
+
+            for attribute_name, value in elem.attrib.items():
+                key: ColumnPath = tuple(path) + (attribute_name,)
+                statistics.setdefault(key, ColumnStatistics()).add(value)
+            continue
+
+        column_statistics: ColumnStatistics = statistics.setdefault(
+            tuple(path), ColumnStatistics())
+        if has_children.pop() is False:
+            column_statistics.add(elem.text)
+        else:
+            column_statistics.add_unmatched()
+        path.pop()
+        parents.pop()
+        elem.clear()
+        if len(parents) > 0:
+            parents[-1].remove(elem)
+
+    return statistics
+
+
+def _profile_sample(file_path: Union[Path, str]) -> Tuple[str, Optional[Dict[ColumnPath, ColumnStatistics]], str]:
+    try:
+        return str(file_path), profile_document(file_path), ""
+    except (ParseError, OSError) as error:
+        return str(file_path), None, str(error)
+
+
+class XmlProfiler():
+    def __init__(self, sample_size: Optional[int] = 100,
+                 max_workers: Optional[int] = None,
+                 min_confidence: float = 0.9,
+                 element_column: str = "detail"):
+
+        self.sample_size: Optional[int] = sample_size
+        self.max_workers: Optional[int] = max_workers
+        self.min_confidence: float = min_confidence
+        self.sub_column: str = element_column
+        self.unreadable_files: Dict[str, str] = {}
+
+    def profile(self, xml_files: Iterable[Union[Path, str]]) -> Dict[ColumnPath, ColumnStatistics]:
+        """
+        Collect value statistics of the sample documents.
+        Documents which can not be parsed are skipped and kept in `unreadable_files`.
+        """
+        samples: Iterable[Union[Path, str]] = xml_files \
+            if self.sample_size is None else islice(xml_files, self.sample_size)
+
+        statistics: Dict[ColumnPath, ColumnStatistics] = {}
+        self.unreadable_files = {}
+        if self.max_workers == 1:
+            for result in map(_profile_sample, samples):
+                self._merge_sample(statistics, *result)
+            return statistics
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(_profile_sample, samples, chunksize=4):
+                self._merge_sample(statistics, *result)
+        return statistics
+
+    def refine(self, schema: BqSchema,
+               xml_files: Iterable[Union[Path, str]]) -> List[ColumnRefinement]:
+        """
+        Narrow STRING columns of the schema (in place) to the type
+        which every sampled value parses as.
+        REQUIRED columns having empty samples are kept as STRING.
+        """
+        return self.refine_by_statistics(schema, self.profile(xml_files))
+
+    def refine_by_statistics(self, schema: BqSchema,
+                             statistics: Dict[ColumnPath, ColumnStatistics]) -> List[ColumnRefinement]:
+        columns: List[Tuple[ColumnPath, BqUnitSchema, List[ColumnPath]]] = []
+        self._collect_columns(schema, (), columns)
+
+        refinements: List[ColumnRefinement] = []
+        for column_path, unit, keys in columns:
+            if unit.column_type != BqColumnType.STRING:
+                continue
+
+            found: List[ColumnStatistics] = [
+                statistics[key] for key in keys if key in statistics]
+            if len(found) == 0:
+                continue
+            column_statistics: ColumnStatistics = ColumnStatistics()
+            for sub_statistics in found:
+                column_statistics.merge(sub_statistics)
+
+            narrowed: Optional[BqColumnType] = column_statistics.narrowed_type()
+            confidence: float = column_statistics.confidence()
+            if (narrowed is None) or (confidence < self.min_confidence):
+                continue
+            # An empty value can not be loaded into a REQUIRED non-STRING column.
+            if (unit.column_mode == BqColumnMode.REQUIRED) and (column_statistics.empty > 0):
+                continue
+
+            unit.column_type = narrowed
+            refinements.append(ColumnRefinement(
+                column_path, BqColumnType.STRING, narrowed,
+                confidence, column_statistics.count
+            ))
+
+        return refinements
+
+    def _collect_columns(self, schema: BqSchema, parent: ColumnPath,
+                         columns: List[Tuple[ColumnPath, BqUnitSchema, List[ColumnPath]]]):
+        """
+        Collect each unit column with its schema path,
+        and the keys of the statistics whose values are stored in it.
+        """
+        column_path: ColumnPath = parent + (schema.column_name,)
+        if isinstance(schema, BqUnitSchema) is True:
+            keys: List[ColumnPath] = [column_path]
+            # Text of an element having attributes is stored in sub column.
+            if (len(parent) > 0) and (schema.column_name == self.sub_column):
+                keys.append(parent)
+            columns.append((column_path, schema, keys))
+            return
+
+        if isinstance(schema, BqRecordSchema) is True:
+            for sub_schema in schema.fields:
+                self._collect_columns(sub_schema, column_path, columns)
+
+    def _merge_sample(self, statistics: Dict[ColumnPath, ColumnStatistics], file_path: str,
+                      document: Optional[Dict[ColumnPath, ColumnStatistics]], error: str):
+
+        if document is None:
+            self.unreadable_files[file_path] = error
+            return
+
+        for column_path, column_statistics in document.items():
+            before: Optional[ColumnStatistics] = statistics.get(column_path)
+            if before is None:
+                statistics[column_path] = column_statistics
+            else:
+                before.merge(column_statistics)
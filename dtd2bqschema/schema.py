@@ -15,6 +15,7 @@ from .dtddefinition import (
     ElementFactorDef,
     RefElementDef,
     RefEntityDef,
+    AttributeDef,
     ElementAttributeDef,
     EntityDef,
     EntityAvailableDef
@@ -57,6 +58,29 @@ class DtdSchema():
         self.sub_column: str = element_column
         self.not_founds_element: Set[str] = set()
 
+        for attribute_info in element_attributes.values():
+            attribute_info.attributes = self._exchange_attributes(
+                attribute_info.attributes, set())
+
+    def _exchange_attributes(self, attributes: list, expanding: Set[str]) -> List[AttributeDef]:
+        exchanged: List[AttributeDef] = []
+        for attribute in attributes:
+            if isinstance(attribute, AttributeDef) is True:
+                exchanged.append(attribute)
+                continue
+            if (isinstance(attribute, RefEntityDef) is False) or (attribute.entity_name in expanding):
+                continue
+
+            sub_entity: Optional[EntityDef] = self.entities.get(attribute.entity_name)
+            if sub_entity is None:
+                continue
+            contents = sub_entity.contents \
+                if isinstance(sub_entity.contents, tuple) else (sub_entity.contents,)
+            exchanged.extend(self._exchange_attributes(
+                list(contents), expanding | {attribute.entity_name}))
+
+        return exchanged
+
     def to_json(self, element_name: str) -> BqSchema:
         element: ElementDef = self.elements[element_name]
         return self.to_json_element(element)
@@ -181,8 +205,17 @@ class Dtd2BqSchema():
         return self.parse_from_string(dtd_str, top_node)
 
     def parse_from_string(self, dtd_str: str, top_node: str) -> BqSchema:
+        schema: DtdSchema = self.parse_definitions_from_string(dtd_str)
+        return schema.to_json(top_node)
+
+    def parse_definitions_from_file(self, file_path: Union[Path, str]) -> DtdSchema:
+        with open(file_path) as file:
+            dtd_str: str = file.read()
+
+        return self.parse_definitions_from_string(dtd_str)
+
+    def parse_definitions_from_string(self, dtd_str: str) -> DtdSchema:
         result: Tree = self.parser.parse(dtd_str)
         converted: list = DtdTransformer().transform(result)
 
-        schema: DtdSchema = DtdSchema(converted)
-        return schema.to_json(top_node)
+        return DtdSchema(converted)
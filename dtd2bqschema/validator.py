@@ -0,0 +1,219 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import copy
+from itertools import islice
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import Element, ParseError, iterparse
+
+from .dtddefinition import (
+    AttributeDef,
+    AttributePattern,
+    ElementAttributeDef
+)
+from .automaton import AutomatonCompiler, ContentAutomaton
+from .schema import DtdSchema
+
+
+# Files sent to a worker at once, and chunks kept in flight per worker.
+CHUNK_SIZE: int = 4
+CHUNKS_PER_WORKER: int = 4
+
+
+class Violation():
+    def __init__(self, file_path: str, path: str, message: str):
+        self.file_path: str = file_path
+        self.path: str = path
+        self.message: str = message
+
+    def __repr__(self):
+        return f"Violation({self.file_path!r}, {self.path!r}, {self.message!r})"
+
+
+class _ElementState():
+    __slots__ = ("element", "element_name", "path", "automaton", "state", "counts")
+
+    def __init__(self, element: Element, element_name: str, path: str,
+                 automaton: Optional[ContentAutomaton]):
+        self.element: Element = element
+        self.element_name: str = element_name
+        self.path: str = path
+        self.automaton: Optional[ContentAutomaton] = automaton
+        # None after a violation, or for undeclared elements.
+        self.state: Optional[int] = ContentAutomaton.START if automaton is not None else None
+        self.counts: Dict[str, int] = {}
+
+
+class XmlValidator():
+    def __init__(self, dtd_schema: DtdSchema,
+                 top_node: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+
+        self.compiler: AutomatonCompiler = AutomatonCompiler(
+            dtd_schema.elements, dtd_schema.entities)
+        self.required_attributes: Dict[str, Set[str]] = {
+            element_name: self._required_attributes(attribute_info)
+            for element_name, attribute_info in dtd_schema.element_attributes.items()
+        }
+        self.top_node: Optional[str] = top_node
+        self.max_workers: Optional[int] = max_workers
+
+    @staticmethod
+    def _required_attributes(attribute_info: ElementAttributeDef) -> Set[str]:
+        return {
+            attribute.attribute_name for attribute in attribute_info.attributes
+            if isinstance(attribute, AttributeDef)
+            and attribute.default_pattern == AttributePattern.REQUIRED
+        }
+
+    def validate_file(self, file_path: Union[Path, str]) -> List[Violation]:
+        """
+        Check child order and cardinality, and "#REQUIRED" attributes
+        of each element in one streaming pass.
+        A document which is not well-formed is reported as a violation
+        at the element being parsed.
+        """
+        file_name: str = str(file_path)
+        violations: List[Violation] = []
+        stack: List[_ElementState] = []
+
+        try:
+            self._validate_events(file_name, stack, violations)
+        except ParseError as error:
+            # The message of ParseError contains the line and column.
+            violations.append(Violation(
+                file_name, stack[-1].path if len(stack) > 0 else "/",
+                f"not well-formed: {error}"))
+        except OSError as error:
+            violations.append(Violation(file_name, "", str(error)))
+
+        return violations
+
+    def _validate_events(self, file_name: str, stack: List[_ElementState],
+                         violations: List[Violation]):
+
+        for event, elem in iterparse(file_name, events=("start", "end")):
+            if event == "end":
+                self._check_end(file_name, stack.pop(), violations)
+                elem.clear()
+                if len(stack) > 0:
+                    stack[-1].element.remove(elem)
+                continue
+
+            tag: str = elem.tag
+            if len(stack) == 0:
+                path: str = f"/{tag}"
+                if (self.top_node is not None) and (tag != self.top_node):
+                    violations.append(Violation(
+                        file_name, path, f"root element must be <{self.top_node}>"))
+            else:
+                parent: _ElementState = stack[-1]
+                index: int = parent.counts.get(tag, 0) + 1
+                parent.counts[tag] = index
+                path: str = f"{parent.path}/{tag}[{index}]"
+                self._check_child(file_name, parent, tag, violations)
+
+            automaton: Optional[ContentAutomaton] = self.compiler.automaton(tag)
+            if automaton is None:
+                violations.append(Violation(
+                    file_name, path, f"element <{tag}> is not declared"))
+
+            missings: Set[str] = self.required_attributes.get(
+                tag, set()).difference(elem.attrib.keys())
+            for attribute_name in sorted(missings):
+                violations.append(Violation(
+                    file_name, path, f"required attribute '{attribute_name}' is missing"))
+
+            stack.append(_ElementState(elem, tag, path, automaton))
+
+    def _check_child(self, file_name: str, parent: _ElementState, tag: str,
+                     violations: List[Violation]):
+
+        if parent.state is None:
+            return
+
+        next_state: Optional[int] = parent.automaton.next_state(parent.state, tag)
+        if next_state is None:
+            expected: List[str] = parent.automaton.expected(parent.state)
+            violations.append(Violation(
+                file_name, parent.path,
+                f"unexpected element <{tag}>, expected {self._describe(expected, parent, parent.state)}"
+            ))
+        parent.state = next_state
+
+    def _check_end(self, file_name: str, current: _ElementState, violations: List[Violation]):
+        if (current.state is None) or current.automaton.is_accepting(current.state):
+            return
+
+        expected: List[str] = current.automaton.expected(current.state)
+        violations.append(Violation(
+            file_name, current.path,
+            f"incomplete content, expected {self._describe(expected, current, current.state)}"
+        ))
+
+    @staticmethod
+    def _describe(expected: List[str], current: _ElementState, state: int) -> str:
+        names: List[str] = [f"<{name}>" for name in expected]
+        if current.automaton.is_accepting(state) is True:
+            names.append("end of element")
+        return " or ".join(names) if len(names) > 0 else "no child element"
+
+    def validate_files(self, xml_files: Iterable[Union[Path, str]]) -> Iterator[Tuple[str, List[Violation]]]:
+        """
+        Validate files across a process pool. Yields (file path, violations) in input order.
+        Files are read from the iterable only as results are consumed, and pending files
+        are cancelled when the iteration stops early.
+        """
+        if self.max_workers == 1:
+            for file_path in xml_files:
+                yield str(file_path), self.validate_file(file_path)
+            return
+
+        # Compile every element once here, and send the workers only the automata
+        # and the required attributes instead of the whole definitions.
+        worker_validator: XmlValidator = copy(self)
+        worker_validator.compiler = self.compiler.compiled()
+        workers: int = self.max_workers if self.max_workers is not None else (os.cpu_count() or 1)
+        files: Iterator[Union[Path, str]] = iter(xml_files)
+        pending: Deque[Future] = deque()
+
+        executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(worker_validator,))
+        try:
+            for _ in range(workers * CHUNKS_PER_WORKER):
+                if self._submit_chunk(executor, files, pending) is False:
+                    break
+
+            while len(pending) > 0:
+                results: List[Tuple[str, List[Violation]]] = pending.popleft().result()
+                self._submit_chunk(executor, files, pending)
+                for result in results:
+                    yield result
+        finally:
+            # Stopped early: cancel the files not started yet, and do not wait for running ones.
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=(len(pending) == 0))
+
+    @staticmethod
+    def _submit_chunk(executor: ProcessPoolExecutor, files: Iterator[Union[Path, str]],
+                      pending: Deque[Future]) -> bool:
+
+        chunk: List[Union[Path, str]] = list(islice(files, CHUNK_SIZE))
+        if len(chunk) == 0:
+            return False
+        pending.append(executor.submit(_validate_chunk_in_worker, chunk))
+        return True
+
+
+_worker_validator: Optional[XmlValidator] = None
+
+
+def _init_worker(validator: XmlValidator):
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_chunk_in_worker(file_paths: List[Union[Path, str]]) -> List[Tuple[str, List[Violation]]]:
+    return [(str(file_path), _worker_validator.validate_file(file_path)) for file_path in file_paths]
@@ -0,0 +1,99 @@
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dtd2bqschema import Dtd2BqSchema, BqSchema, XmlProfiler, ColumnStatistics, ColumnRefinement  # noqa: E402
+
+
+DATA_DIR: Path = Path(__file__).parent / "data" / "profiler"
+SAMPLES: List[Path] = [DATA_DIR / name for name in ("sample_1.xml", "malformed.xml", "sample_2.xml")]
+
+
+class XmlProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.schema: BqSchema = Dtd2BqSchema().parse_from_file(
+            DATA_DIR / "records.dtd", "records")
+
+    def refine(self, max_workers: int) -> Dict[str, str]:
+        profiler: XmlProfiler = XmlProfiler(
+            max_workers=max_workers, min_confidence=0.0)
+        refinements: List[ColumnRefinement] = profiler.refine(self.schema, SAMPLES)
+
+        self.assertEqual(list(profiler.unreadable_files.keys()),
+                         [str(DATA_DIR / "malformed.xml")])
+        return {".".join(refinement.column_path): refinement.after.value
+                for refinement in refinements}
+
+    def test_refine(self):
+        self.assertEqual(self.refine(max_workers=1), {
+            "records.record.id": "INT64",
+            "records.record.amount": "FLOAT",
+            "records.record.day": "DATE",
+            "records.record.updated": "DATETIME",
+            "records.record.note": "INT64",
+        })
+        # zip and price have zero-padded values, code is REQUIRED and has an empty value.
+        self.assertIn('{"name":"zip","type":"STRING","mode":"REQUIRED"}', self.schema.to_json())
+        self.assertIn('{"name":"price","type":"STRING","mode":"REQUIRED"}', self.schema.to_json())
+        self.assertIn('{"name":"code","type":"STRING","mode":"REQUIRED"}', self.schema.to_json())
+
+    def test_refine_in_process_pool(self):
+        self.assertEqual(len(self.refine(max_workers=2)), 5)
+
+    def test_mixed_content(self):
+        schema: BqSchema = Dtd2BqSchema().parse_from_file(
+            DATA_DIR / "mixed.dtd", "texts")
+        profiler: XmlProfiler = XmlProfiler(max_workers=1, min_confidence=0.0)
+
+        # "<para>see <em>3</em></para>" keeps the column as STRING.
+        self.assertEqual(profiler.refine(schema, [DATA_DIR / "mixed.xml"]), [])
+        self.assertIn('{"name":"para","type":"STRING","mode":"REPEATED"}', schema.to_json())
+
+    def test_sub_column(self):
+        schema: BqSchema = Dtd2BqSchema().parse_from_file(
+            DATA_DIR / "measures.dtd", "measures")
+        profiler: XmlProfiler = XmlProfiler(max_workers=1, min_confidence=0.0)
+        refinements: List[ColumnRefinement] = profiler.refine(
+            schema, [DATA_DIR / "measures.xml"])
+
+        # The text of <weight unit="..."> is stored in, and reported as, the "detail" column.
+        self.assertEqual([(refinement.column_path, refinement.after.value) for refinement in refinements], [
+            (("measures", "weight", "detail"), "FLOAT"),
+        ])
+
+    def test_min_confidence(self):
+        profiler: XmlProfiler = XmlProfiler(max_workers=1)
+        self.assertEqual(profiler.refine(self.schema, SAMPLES), [])
+
+    def test_statistics(self):
+        statistics: ColumnStatistics = ColumnStatistics()
+        for value in ["1", "01", " 2 ", "", None]:
+            statistics.add(value)
+
+        self.assertEqual(statistics.count, 3)
+        self.assertEqual(statistics.empty, 2)
+        self.assertIsNone(statistics.narrowed_type())
+
+        other: ColumnStatistics = ColumnStatistics()
+        for value in range(3, 100):
+            other.add(str(value))
+        statistics.merge(other)
+        self.assertEqual(statistics.count, 100)
+        self.assertAlmostEqual(other.confidence(), 1.0 - 3.0 / 97)
+
+    def test_out_of_int64(self):
+        statistics: ColumnStatistics = ColumnStatistics()
+        for value in ["12345678901234567890", "1.5"]:
+            statistics.add(value)
+
+        # 20 digits IDs are neither INT64 nor FLOAT.
+        self.assertEqual(statistics.matched, [0, 1, 0, 0])
+        self.assertIsNone(statistics.narrowed_type())
+
+
+if __name__ == "__main__":
+    unittest.main()
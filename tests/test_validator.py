@@ -0,0 +1,90 @@
+import sys
+import unittest
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dtd2bqschema import Dtd2BqSchema, DtdSchema, XmlValidator, Violation  # noqa: E402
+from dtd2bqschema.validator import CHUNK_SIZE, CHUNKS_PER_WORKER  # noqa: E402
+
+
+DATA_DIR: Path = Path(__file__).parent / "data" / "validator"
+
+
+class XmlValidatorTest(unittest.TestCase):
+
+    def setUp(self):
+        dtd_schema: DtdSchema = Dtd2BqSchema().parse_definitions_from_file(
+            DATA_DIR / "book.dtd")
+        self.validator: XmlValidator = XmlValidator(
+            dtd_schema, top_node="book", max_workers=1)
+
+    def validate(self, file_name: str) -> List[Tuple[str, str]]:
+        violations: List[Violation] = self.validator.validate_file(
+            DATA_DIR / file_name)
+        return [(violation.path, violation.message) for violation in violations]
+
+    def test_valid(self):
+        # "?", "*", "+", mixed content, EMPTY, parameter entity and "&" in any order
+        self.assertEqual(self.validate("valid.xml"), [])
+
+    def test_invalid(self):
+        self.assertEqual(self.validate("invalid.xml"), [
+            ("/book", "unexpected element <subtitle>, expected <chapter>"),
+            ("/book/chapter[1]", "required attribute 'id' is missing"),
+            ("/book/chapter[1]/note[1]",
+             "unexpected element <em>, expected end of element"),
+            ("/book/chapter[2]", "incomplete content, expected <note> or <para>"),
+            ("/book/chapter[3]", "unexpected element <para>, expected <title>"),
+            ("/book/unknown[1]", "element <unknown> is not declared"),
+            ("/book/meta[1]", "incomplete content, expected <year>"),
+        ])
+
+    def test_must_repeat(self):
+        self.assertEqual(self.validate("no_chapter.xml"), [
+            ("/book", "unexpected element <meta>, expected <chapter> or <subtitle>"),
+        ])
+
+    def test_root_element(self):
+        dtd_schema: DtdSchema = Dtd2BqSchema().parse_definitions_from_file(
+            DATA_DIR / "book.dtd")
+        validator: XmlValidator = XmlValidator(dtd_schema, top_node="chapter")
+        violations: List[Violation] = validator.validate_file(
+            DATA_DIR / "valid.xml")
+        self.assertEqual([(violation.path, violation.message) for violation in violations], [
+            ("/book", "root element must be <chapter>"),
+        ])
+
+    def test_malformed(self):
+        self.assertEqual(self.validate("malformed.xml"), [
+            ("/book/title[1]", "not well-formed: undefined entity: line 3, column 14"),
+        ])
+
+    def test_validate_files(self):
+        file_names: List[str] = ["valid.xml", "malformed.xml", "missing.xml", "invalid.xml"]
+        self.validator.max_workers = 2
+        results: List[Tuple[str, List[Violation]]] = list(
+            self.validator.validate_files(DATA_DIR / name for name in file_names))
+
+        self.assertEqual([Path(file_path).name for file_path, _ in results], file_names)
+        self.assertEqual([len(violations) for _, violations in results], [0, 1, 1, 7])
+        self.assertEqual(results[2][1][0].path, "")
+
+    def test_validate_files_lazily(self):
+        consumed: List[int] = []
+
+        def xml_files() -> Iterator[Path]:
+            for index in range(10000):
+                consumed.append(index)
+                yield DATA_DIR / "valid.xml"
+
+        self.validator.max_workers = 2
+        results: Iterator[Tuple[str, List[Violation]]] = self.validator.validate_files(xml_files())
+        self.assertEqual(next(results)[1], [])
+        results.close()
+        self.assertLessEqual(len(consumed), 2 * CHUNKS_PER_WORKER * CHUNK_SIZE + CHUNK_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()